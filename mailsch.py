@@ -1,20 +1,275 @@
+import dns.asyncresolver
+import dns.exception
+import dns.rdataclass
+import dns.rdatatype
 import dns.resolver
+import dns.reversename
 import socket
 import smtplib
 import concurrent.futures
-import json
 import platform
-from typing import List, Dict, Optional
+import time
+import hashlib
+import re
+import contextlib
+import copy
+from collections import OrderedDict, deque
+from typing import List, Dict, Optional, Tuple, Any, AsyncIterator
 from datetime import datetime
-from flask import Flask, request, jsonify
+from quart import Quart, Response, request, jsonify
+from quart.json.provider import DefaultJSONProvider
+import uvicorn
 import threading
 import asyncio
 
-app = Flask(__name__)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson and writes response bytes directly."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=self.default), mimetype=self.mimetype)
+
+app = Quart(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+BLACKLISTS = (
+    "zen.spamhaus.org",
+    "b.barracudacentral.org",
+    "dnsbl.sorbs.net",
+    "bl.spamcop.net",
+    "dnsbl-1.uceprotect.net",
+    "cbl.abuseat.org",
+    "dnsbl.dronebl.org",
+    "psbl.surriel.com",
+    "rbl.efnetrbl.org"
+)
+
+# Matched against the raw TXT bytes; the version tag must be followed by whitespace, ';' or the end.
+_SPF_RE = re.compile(rb'v=spf1(?:\s|$)', re.IGNORECASE)
+_DMARC_RE = re.compile(rb'v\s*=\s*DMARC1\s*(?:;|$)')  # RFC 7489: the version tag is case-sensitive.
+
+DNS_CACHE_SIZE = 4096
+DNS_CACHE_MAX_TTL = 3600  # Upper bound on how long any answer is kept, in seconds.
+DNS_NEGATIVE_TTL = 300  # Lifetime of cached NXDOMAIN/NoAnswer results, in seconds.
+DNS_STALE_TTL = 300  # How long an expired answer may still be served (RFC 8767), in seconds.
+DNSBL_CONCURRENCY = 32  # Maximum DNSBL queries in flight at once per diagnostics run.
+DNSBL_CLEAN_TTL = 3600  # How long a clean DNSBL result is trusted for an IP never seen listed, in seconds.
+DNS_TIMEOUT = 1.0  # Per-try DNS timeout, in seconds.
+DNS_LIFETIME = 2.0  # Total time budget for one DNS lookup including retries, in seconds.
+DNSBL_FAILURE_WINDOW = 10  # A zone whose last this-many queries all failed is skipped for a while.
+DNSBL_COOLDOWN = 300  # How long a failing DNSBL zone is skipped, in seconds.
+SMTP_PORT = 25
+SMTP_TIMEOUT = 5.0  # Connect and command timeout for SMTP probes, in seconds.
+SMTP_IDLE_TIMEOUT = 100  # Pooled SMTP connections idle longer than this are closed, in seconds.
+
+class DNSCache:
+    """Thread-safe LRU cache of DNS answers that honors per-record TTLs.
+
+    Expired entries are kept for DNS_STALE_TTL seconds so callers can serve
+    them while a fresh answer is fetched.
+    """
+
+    def __init__(self, maxsize: int = DNS_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[Tuple[Any, bool]]:
+        """Return (value, is_stale) for key, or None if missing or past its stale window."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, stale_until = entry
+            now = time.monotonic()
+            if stale_until <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value, expires_at <= now
+
+    def set(self, key: Tuple[str, str], value: Any, ttl: float):
+        """Store value under key for ttl seconds, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + min(ttl, DNS_CACHE_MAX_TTL)
+        with self._lock:
+            self._entries[key] = (value, expires_at, expires_at + DNS_STALE_TTL)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+class BloomFilter:
+    """Fixed-size Bloom filter of strings; membership may be a false positive, never a false negative."""
+
+    def __init__(self, size_bits: int = 1 << 20, hashes: int = 4):
+        self.size_bits = size_bits
+        self.hashes = hashes
+        self._bits = bytearray(size_bits // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, item: str) -> List[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=4 * self.hashes).digest()
+        return [int.from_bytes(digest[i:i + 4], 'little') % self.size_bits for i in range(0, len(digest), 4)]
+
+    def add(self, item: str):
+        with self._lock:
+            for pos in self._positions(item):
+                self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+class ZoneCircuitBreaker:
+    """Tracks recent query outcomes per DNSBL zone and benches zones that keep failing."""
+
+    def __init__(self, window: int = DNSBL_FAILURE_WINDOW, cooldown: float = DNSBL_COOLDOWN):
+        self.window = window
+        self.cooldown = cooldown
+        self._health: Dict[str, deque] = {}
+        self._cooldown_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def available(self, zone: str) -> bool:
+        """Return False while zone is cooling down after repeated failures."""
+        with self._lock:
+            return self._cooldown_until.get(zone, 0) <= time.monotonic()
+
+    def record(self, zone: str, ok: bool):
+        """Record one query outcome, opening the breaker if the whole window failed."""
+        with self._lock:
+            history = self._health.setdefault(zone, deque(maxlen=self.window))
+            history.append(ok)
+            if len(history) == self.window and not any(history):
+                self._cooldown_until[zone] = time.monotonic() + self.cooldown
+                history.clear()
+
+class SmtpConnectionPool:
+    """Keeps idle SMTP sessions per (host, port) so repeated checks skip the TCP and greeting round-trips.
+
+    A connection is handed to one caller at a time and checked with NOOP
+    before reuse. A background thread closes sessions idle longer than
+    idle_timeout.
+    """
+
+    def __init__(self, idle_timeout: float = SMTP_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._idle: Dict[Tuple[str, int], Tuple[smtplib.SMTP, float]] = {}
+        self._lock = threading.Lock()
+        self._reaper = None
+
+    @staticmethod
+    def _close(smtp: smtplib.SMTP):
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
+
+    def acquire(self, host: str, port: int = SMTP_PORT, timeout: float = SMTP_TIMEOUT) -> smtplib.SMTP:
+        """Return a live pooled connection to host, or open a new one."""
+        with self._lock:
+            entry = self._idle.pop((host, port), None)
+        if entry is not None:
+            smtp, last_used = entry
+            if time.monotonic() - last_used < self.idle_timeout:
+                try:
+                    # Honor this caller's timeout rather than the one the session was opened with.
+                    smtp.timeout = timeout
+                    smtp.sock.settimeout(timeout)
+                    if smtp.noop()[0] == 250:
+                        return smtp
+                except (smtplib.SMTPException, OSError):
+                    pass
+            self._close(smtp)
+        return smtplib.SMTP(host, port, timeout=timeout)
+
+    def release(self, host: str, port: int, smtp: smtplib.SMTP):
+        """Return a healthy connection to the pool, closing it if the slot is already taken."""
+        with self._lock:
+            if (host, port) in self._idle:
+                extra = smtp
+            else:
+                self._idle[(host, port)] = (smtp, time.monotonic())
+                extra = None
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap, daemon=True)
+                self._reaper.start()
+        if extra is not None:
+            self._close(extra)
+
+    @contextlib.contextmanager
+    def connection(self, host: str, port: int = SMTP_PORT, timeout: float = SMTP_TIMEOUT):
+        """Context manager yielding a pooled connection; it is discarded if the block raises."""
+        smtp = self.acquire(host, port, timeout)
+        try:
+            yield smtp
+        except BaseException:
+            self._close(smtp)
+            raise
+        self.release(host, port, smtp)
+
+    def close_idle(self):
+        """Close connections that have been idle longer than idle_timeout."""
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            expired = [key for key, (_, last_used) in self._idle.items() if last_used < cutoff]
+            stale = [self._idle.pop(key)[0] for key in expired]
+        for smtp in stale:
+            self._close(smtp)
+
+    def _reap(self):
+        while True:
+            time.sleep(self.idle_timeout / 10)
+            self.close_idle()
+
+# One resolver for the whole process, so /etc/resolv.conf is parsed once rather than per checker.
+_resolver = dns.asyncresolver.Resolver()
+_resolver.timeout = DNS_TIMEOUT
+_resolver.lifetime = DNS_LIFETIME
+_dns_cache = DNSCache()
+_smtp_pool = SmtpConnectionPool()
+# IPs (reversed, as queried) that have ever been listed on any DNSBL; those never skip the network lookup.
+_listed_ips = BloomFilter()
+# (reversed ip, blacklist) pairs that recently came back clean.
+_clean_ips = DNSCache()
+_zone_breaker = ZoneCircuitBreaker()
+_refresh_tasks = set()  # Keeps background refreshes referenced until they finish.
+# Lookups currently on the wire, so concurrent callers share one query.
+# concurrent.futures.Future lets callers on other threads' event loops wait on it too.
+_inflight: Dict[Tuple[str, str], concurrent.futures.Future] = {}
+_inflight_lock = threading.Lock()
+
+def reverse_ipv4(ip: str) -> Optional[str]:
+    """Return an IPv4 address with its octets reversed, as DNSBL queries expect, or None if ip is not IPv4."""
+    octets = ip.split('.')
+    if len(octets) != 4 or not all(octet.isdigit() and int(octet) <= 255 for octet in octets):
+        return None
+    return '.'.join(reversed(octets))
+
+async def prewarm_blacklists():
+    """Look up each DNSBL zone's NS records to warm the upstream recursive resolver.
+
+    Nothing is stored in the in-process cache: DNSBL checks query
+    <reversed ip>.<zone> A, so only the upstream's delegation cache helps.
+    """
+    await asyncio.gather(*[_resolver.resolve(bl, 'NS') for bl in BLACKLISTS], return_exceptions=True)
 
 class MXChecker:
-    def __init__(self, domain: str):
+    def __init__(self, domain: str, dns_timeout: float = DNS_TIMEOUT, dns_lifetime: float = DNS_LIFETIME,
+                 smtp_timeout: float = SMTP_TIMEOUT):
         self.domain = domain.lower().strip()
+        self.smtp_timeout = smtp_timeout
+        self._txt_records = None
         self.mx_records = []
         self.results = {
             "domain": self.domain,
@@ -23,29 +278,112 @@ class MXChecker:
             "diagnostics": {},
             "timestamp": datetime.utcnow().isoformat()
         }
-        self.blacklists = [
-            "zen.spamhaus.org",
-            "b.barracudacentral.org",
-            "dnsbl.sorbs.net",
-            "bl.spamcop.net",
-            "dnsbl-1.uceprotect.net",
-            "cbl.abuseat.org",
-            "dnsbl.dronebl.org",
-            "psbl.surriel.com",
-            "rbl.efnetrbl.org"
-        ]
+        self.blacklists = BLACKLISTS
+        if (dns_timeout, dns_lifetime) == (_resolver.timeout, _resolver.lifetime):
+            self.resolver = _resolver
+        else:
+            # Custom timeouts get their own copy so the shared resolver is left untouched.
+            self.resolver = copy.copy(_resolver)
+            self.resolver.timeout = dns_timeout
+            self.resolver.lifetime = dns_lifetime
+
+    async def _cached_resolve(self, qname: str, qtype: str) -> dns.resolver.Answer:
+        """Resolve a query through the shared DNS cache.
+
+        Negative answers are cached as well and re-raised on later hits. Stale
+        entries are returned immediately and refreshed in the background.
+        """
+        cached = _dns_cache.get((qname.lower(), qtype))
+        if cached is None:
+            return await self._resolve_once(qname, qtype)
+        value, stale = cached
+        if stale:
+            task = asyncio.ensure_future(self._refresh(qname, qtype))
+            _refresh_tasks.add(task)
+            task.add_done_callback(_refresh_tasks.discard)
+        if isinstance(value, type) and issubclass(value, Exception):
+            raise value()
+        return value
+
+    async def _resolve_once(self, qname: str, qtype: str) -> dns.resolver.Answer:
+        """Resolve a query, joining an identical lookup already in flight if there is one."""
+        key = (qname.lower(), qtype)
+        with _inflight_lock:
+            pending = _inflight.get(key)
+            if pending is None:
+                future = _inflight[key] = concurrent.futures.Future()
+                # Mark running so a cancelled waiter cannot cancel the shared future.
+                future.set_running_or_notify_cancel()
+
+        if pending is not None:
+            waiter = asyncio.wrap_future(pending)
+            await asyncio.wait([waiter])
+            error = waiter.exception()
+            if isinstance(error, asyncio.CancelledError):
+                # The owning task was cancelled mid-lookup; resolve on our own.
+                return await self._resolve_once(qname, qtype)
+            if error is not None:
+                raise error
+            return waiter.result()
+
+        try:
+            answer = await self._resolve_and_store(qname, qtype)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(answer)
+            return answer
+        finally:
+            with _inflight_lock:
+                del _inflight[key]
+
+    async def _resolve_and_store(self, qname: str, qtype: str) -> dns.resolver.Answer:
+        """Query the resolver and store the outcome in the shared DNS cache.
 
-    def get_mx_records(self) -> List[Dict]:
+        A records in the ADDITIONAL section of an MX response are cached too,
+        so resolving the MX hosts afterwards needs no extra round-trip.
+        """
+        key = (qname.lower(), qtype)
+        try:
+            answer = await self.resolver.resolve(qname, qtype)
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
+            _dns_cache.set(key, type(e), DNS_NEGATIVE_TTL)
+            raise
+        _dns_cache.set(key, answer, answer.rrset.ttl)
+        if qtype == 'MX':
+            # Only glue for this answer's own exchanges is trusted; anything else could poison other lookups.
+            exchanges = {record.exchange for record in answer}
+            for rrset in answer.response.additional:
+                if (rrset.rdtype == dns.rdatatype.A and rrset.rdclass == dns.rdataclass.IN
+                        and rrset.name in exchanges):
+                    # An RRset iterates and indexes like an Answer, which is all callers rely on.
+                    name = rrset.name.to_text(omit_final_dot=True).lower()
+                    _dns_cache.set((name, 'A'), rrset, rrset.ttl)
+        return answer
+
+    async def _refresh(self, qname: str, qtype: str):
+        """Refresh a stale cache entry, keeping the stale value if the lookup fails."""
+        try:
+            await self._resolve_once(qname, qtype)
+        except dns.exception.DNSException:
+            pass
+
+    async def get_mx_records(self) -> List[Dict]:
         """Retrieve MX records for the domain."""
         try:
-            answers = dns.resolver.resolve(self.domain, 'MX')
+            answers = await self._cached_resolve(self.domain, 'MX')
             self.mx_records = sorted(
                 [(str(record.exchange).strip().rstrip('.'), record.preference) for record in answers if str(record.exchange).strip()],
                 key=lambda x: x[1]
             )
-            unique_names = list(dict.fromkeys([record[0] for record in self.mx_records if record[0]]))
             self.results["mx_records"] = [{"host": host, "priority": pref} for host, pref in self.mx_records]
-            return [{"host": host, "priority": self.mx_records[[r[0] for r in self.mx_records].index(host)][1]} for host in unique_names]
+            # Records are sorted by preference, so the first entry kept per host has its best priority.
+            unique = {}
+            for host, pref in self.mx_records:
+                if host:
+                    unique.setdefault(host, pref)
+            return [{"host": host, "priority": pref} for host, pref in unique.items()]
         except dns.resolver.NXDOMAIN:
             self.results["diagnostics"]["mx_error"] = f"No MX records found for {self.domain}"
             return []
@@ -53,114 +391,214 @@ class MXChecker:
             self.results["diagnostics"]["mx_error"] = str(e)
             return []
 
-    def check_reverse_dns(self, ip: str) -> Optional[str]:
+    async def check_reverse_dns(self, ip: str) -> Optional[str]:
         """Perform reverse DNS lookup for an IP."""
         try:
-            return socket.gethostbyaddr(ip)[0]
-        except socket.herror:
+            answers = await self._cached_resolve(dns.reversename.from_address(ip).to_text(), 'PTR')
+            return answers[0].target.to_text(omit_final_dot=True)
+        except dns.exception.DNSException:
             return None
 
     def check_smtp(self, mx_host: str) -> Dict:
         """Test SMTP connectivity for an MX host."""
-        result = {"status": "failed", "banner": None, "error": None}
+        result = {"status": "failed", "banner": None, "peer": None, "error": None}
         try:
-            with smtplib.SMTP(mx_host, timeout=10) as smtp:
-                smtp.helo("test.client")
-                banner = smtp.ehlo()[1]
+            with _smtp_pool.connection(mx_host, timeout=self.smtp_timeout) as smtp:
+                # EHLO alone is enough; a separate HELO only costs another round-trip.
+                code, banner = smtp.ehlo("test.client")
                 if isinstance(banner, bytes):
                     banner = banner.decode('utf-8', errors='replace')
-                result.update({"status": "success", "banner": banner, "error": None})
+                if code != 250:
+                    # Raising inside the block makes the pool discard this session.
+                    raise smtplib.SMTPHeloError(code, banner)
+                host, port = smtp.sock.getpeername()[:2]
+                peer = f"[{host}]:{port}" if ':' in host else f"{host}:{port}"
+                result.update({"status": "success", "banner": banner, "peer": peer, "error": None})
+        except smtplib.SMTPHeloError as e:
+            result["error"] = f"EHLO rejected: {e.smtp_code} {e.smtp_error}"
         except Exception as e:
             result["error"] = str(e)
         return result
 
-    def check_blacklist(self, ip: str, blacklist: str) -> Dict:
-        """Check if an IP is listed in a DNSBL."""
+    async def check_blacklist(self, rip: str, blacklist: str) -> Dict:
+        """Check if an IP, given with its octets reversed (see reverse_ipv4), is listed in a DNSBL.
+
+        IPs never seen listed that came back clean within DNSBL_CLEAN_TTL are
+        answered without a query. Zones whose recent queries all failed are
+        skipped and reported with "skipped": True.
+        """
         result = {"blacklist": blacklist, "listed": False}
+        clean = _clean_ips.get((rip, blacklist))
+        if clean is not None and not clean[1] and rip not in _listed_ips:
+            return result
+        if not _zone_breaker.available(blacklist):
+            result["skipped"] = True
+            return result
         try:
-            query = '.'.join(reversed(ip.split('.'))) + '.' + blacklist
-            dns.resolver.resolve(query, 'A')
+            await self._cached_resolve(f"{rip}.{blacklist}", 'A')
             result["listed"] = True
+            _listed_ips.add(rip)
         except dns.resolver.NXDOMAIN:
-            pass
+            _clean_ips.set((rip, blacklist), True, DNSBL_CLEAN_TTL)
         except Exception as e:
             result["error"] = str(e)
+        _zone_breaker.record(blacklist, "error" not in result)
         return result
 
-    def get_spf_record(self) -> Optional[str]:
-        """Retrieve SPF record for the domain."""
+    async def _fetch_txt(self) -> List[Any]:
+        """Retrieve the domain's TXT rdata, querying at most once per checker."""
+        if self._txt_records is None:
+            # Store the task itself so concurrent callers share the one lookup.
+            self._txt_records = asyncio.ensure_future(self._resolve_rdata(self.domain, 'TXT'))
+        return await self._txt_records
+
+    async def _resolve_rdata(self, qname: str, record_type: str) -> List[Any]:
+        """Retrieve the rdata of qname's records of record_type, or [] on any error."""
         try:
-            answers = dns.resolver.resolve(self.domain, 'TXT')
-            for record in answers:
-                if str(record).startswith('v=spf1'):
-                    return str(record)
-            return None
+            return list(await self._cached_resolve(qname, record_type))
         except Exception:
-            return None
+            return []
 
-    def get_dmarc_record(self) -> Optional[str]:
+    @staticmethod
+    def _find_txt(records: List[Any], pattern: re.Pattern) -> Optional[str]:
+        """Return the first TXT record whose joined strings match pattern, decoded."""
+        for record in records:
+            value = b''.join(record.strings)
+            if pattern.match(value):
+                return value.decode('utf-8', errors='replace')
+        return None
+
+    async def get_spf_record(self) -> Optional[str]:
+        """Retrieve SPF record for the domain."""
+        return self._find_txt(await self._fetch_txt(), _SPF_RE)
+
+    async def get_dmarc_record(self) -> Optional[str]:
         """Retrieve DMARC record for the domain."""
-        try:
-            answers = dns.resolver.resolve(f'_dmarc.{self.domain}', 'TXT')
-            for record in answers:
-                if str(record).startswith('v=DMARC1'):
-                    return str(record)
-            return None
-        except Exception:
-            return None
+        return self._find_txt(await self._resolve_rdata(f'_dmarc.{self.domain}', 'TXT'), _DMARC_RE)
 
-    def get_dns_records(self, record_type: str) -> List[str]:
+    async def get_dns_records(self, record_type: str) -> List[str]:
         """Retrieve DNS records of specified type (A, CNAME, TXT)."""
-        try:
-            answers = dns.resolver.resolve(self.domain, record_type)
-            return [str(record) for record in answers]
-        except Exception:
-            return []
+        if record_type == 'TXT':
+            records = await self._fetch_txt()
+        else:
+            records = await self._resolve_rdata(self.domain, record_type)
+        return [str(record) for record in records]
+
+    async def resolve_ip(self, host: str) -> Optional[str]:
+        """Resolve hostname to IP address.
 
-    def resolve_ip(self, host: str) -> Optional[str]:
-        """Resolve hostname to IP address."""
+        The A RRset comes from the shared resolver so its TTL is honored. Names
+        DNS does not know (e.g. from /etc/hosts) fall back to an IPv4-only
+        getaddrinfo, whose outcome is cached for DNS_NEGATIVE_TTL.
+        """
         if not host or not isinstance(host, str):
             return None
         host = host.strip().rstrip('.')
         if len(host) > 253 or not host:
             return None
         try:
-            return socket.gethostbyname(host)
-        except (socket.gaierror, UnicodeError):
+            answers = await self._cached_resolve(host, 'A')
+            return str(answers[0])
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            pass
+        except (dns.exception.DNSException, UnicodeError):
             return None
+        # Remember the fallback's outcome too, so a dead name does not hit libc on every check.
+        key = (host.lower(), 'getaddrinfo')
+        cached = _dns_cache.get(key)
+        if cached is not None and not cached[1]:
+            return cached[0]
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                host, None, family=socket.AF_INET, type=socket.SOCK_STREAM, flags=socket.AI_ADDRCONFIG
+            )
+            ip = infos[0][4][0]
+        except (socket.gaierror, UnicodeError, IndexError):
+            ip = None
+        _dns_cache.set(key, ip, DNS_NEGATIVE_TTL)
+        return ip
 
-    def run_diagnostics(self, max_workers: int = 5) -> Dict:
+    async def run_diagnostics(self, max_workers: int = 5) -> Dict:
         """Run all diagnostics concurrently for MX hosts and additional DNS checks."""
-        unique_hosts = list(dict.fromkeys([record["host"] for record in self.results["mx_records"]]))
-        self.results["diagnostics"]["unique_hosts"] = unique_hosts
-
-        self.results["dns_records"]["A"] = self.get_dns_records("A")
-        self.results["dns_records"]["CNAME"] = self.get_dns_records("CNAME")
-        self.results["dns_records"]["TXT"] = self.get_dns_records("TXT")
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            ip_futures = {executor.submit(self.resolve_ip, host): host for host in unique_hosts}
-            for future in concurrent.futures.as_completed(ip_futures):
-                host = ip_futures[future]
-                ip = future.result()
-                self.results["diagnostics"].setdefault(host, {})["ip"] = ip or "unresolved"
-
-            for host in unique_hosts:
-                ip = self.results["diagnostics"][host].get("ip")
-                if ip and ip != "unresolved":
-                    reverse_dns_future = executor.submit(self.check_reverse_dns, ip)
-                    smtp_future = executor.submit(self.check_smtp, host)
-                    blacklist_futures = [executor.submit(self.check_blacklist, ip, bl) for bl in self.blacklists]
-                    futures = [reverse_dns_future, smtp_future] + blacklist_futures
-                    results = [future.result() for future in concurrent.futures.as_completed(futures)]
-                    self.results["diagnostics"][host]["reverse_dns"] = reverse_dns_future.result()
-                    self.results["diagnostics"][host]["smtp"] = smtp_future.result()
-                    self.results["diagnostics"][host]["blacklists"] = [f.result() for f in blacklist_futures]
-
-        self.results["diagnostics"]["spf"] = self.get_spf_record()
-        self.results["diagnostics"]["dmarc"] = self.get_dmarc_record()
+        async for _ in self.iter_diagnostics(max_workers):
+            pass
         return self.results
 
+    async def iter_diagnostics(self, max_workers: int = 5) -> AsyncIterator[Dict]:
+        """Run all diagnostics concurrently, yielding each result as soon as it completes.
+
+        Events look like {"host": ..., "check": ..., "result": ...}, with host None
+        for domain-level checks. Every result is also recorded in self.results.
+        """
+        unique_hosts = list(dict.fromkeys([record["host"] for record in self.results["mx_records"]]))
+        diagnostics = self.results["diagnostics"]
+        dns_records = self.results["dns_records"]
+        diagnostics["unique_hosts"] = unique_hosts
+        loop = asyncio.get_running_loop()
+
+        # Each task carries the container and key its result belongs in, so completion needs no lookups.
+        async def labeled(host, check, target, key, awaitable):
+            return host, check, target, key, await awaitable
+
+        # Domain-level lookups run alongside the per-host checks below.
+        pending = [
+            asyncio.ensure_future(labeled(None, "A", dns_records, "A", self.get_dns_records("A"))),
+            asyncio.ensure_future(labeled(None, "CNAME", dns_records, "CNAME", self.get_dns_records("CNAME"))),
+            asyncio.ensure_future(labeled(None, "TXT", dns_records, "TXT", self.get_dns_records("TXT"))),
+            asyncio.ensure_future(labeled(None, "spf", diagnostics, "spf", self.get_spf_record())),
+            asyncio.ensure_future(labeled(None, "dmarc", diagnostics, "dmarc", self.get_dmarc_record()))
+        ]
+
+        # DNS queries are awaited on the event loop; the executor only runs the blocking SMTP probes.
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            ips = await asyncio.gather(*[self.resolve_ip(host) for host in unique_hosts])
+            resolved = []
+            for host, ip in zip(unique_hosts, ips):
+                diag = diagnostics.setdefault(host, {})
+                diag["ip"] = ip or "unresolved"
+                if ip:
+                    resolved.append((host, ip, reverse_ipv4(ip), diag))
+                yield {"host": host, "check": "ip", "result": diag["ip"]}
+
+            # Bound DNSBL queries so upstream servers are not flooded.
+            semaphore = asyncio.Semaphore(DNSBL_CONCURRENCY)
+
+            async def limited(coro):
+                async with semaphore:
+                    return await coro
+
+            for host, ip, rip, diag in resolved:
+                pending.append(asyncio.ensure_future(
+                    labeled(host, "reverse_dns", diag, "reverse_dns", self.check_reverse_dns(ip))
+                ))
+                pending.append(asyncio.ensure_future(
+                    labeled(host, "smtp", diag, "smtp", loop.run_in_executor(executor, self.check_smtp, host))
+                ))
+                blacklists = diag["blacklists"] = [None] * len(self.blacklists) if rip else []
+                if rip:
+                    pending.extend(
+                        asyncio.ensure_future(
+                            labeled(host, "blacklist", blacklists, i, limited(self.check_blacklist(rip, bl)))
+                        )
+                        for i, bl in enumerate(self.blacklists)
+                    )
+
+            for next_done in asyncio.as_completed(pending):
+                host, check, target, key, result = await next_done
+                target[key] = result
+                yield {"host": host, "check": check, "result": result}
+        finally:
+            # Only reached early if the consumer stops iterating; drop whatever is still running.
+            for task in pending:
+                task.cancel()
+            executor.shutdown(wait=False)
+
+    async def check(self) -> Dict:
+        """Look up MX records and run the full diagnostics suite."""
+        await self.get_mx_records()
+        return await self.run_diagnostics()
+
     def display_results(self):
         """Display results in a formatted manner."""
         print(f"\nMX Server Check for {self.domain} ({self.results['timestamp']} UTC)")
@@ -191,6 +629,8 @@ class MXChecker:
                     print(f"    {bl_name}: {bl_listed}")
                     if "error" in bl:
                         print(f"      Error: {bl['error']}")
+                    if bl.get("skipped"):
+                        print("      Skipped: zone has been failing, retrying later")
                 else:
                     print(f"    Invalid entry: {bl}")
 
@@ -199,28 +639,45 @@ class MXChecker:
         print("=" * 50)
 
 @app.route('/api/check', methods=['POST'])
-def api_check_domain():
+async def api_check_domain():
     try:
-        data = request.get_json()
+        data = await request.get_json()
         if not data or 'domain' not in data:
             return jsonify({"error": "Domain is required in JSON payload"}), 400
         domain = data['domain'].strip()
         if not domain:
             return jsonify({"error": "Domain cannot be empty"}), 400
         checker = MXChecker(domain)
-        checker.get_mx_records()
-        results = checker.run_diagnostics()
+        if request.accept_mimetypes.best_match(['application/json', 'text/event-stream']) == 'text/event-stream':
+            return Response(stream_check(checker), mimetype='text/event-stream')
+        results = await checker.check()
         return jsonify(results)
     except Exception as e:
         return jsonify({"error": f"Internal server error: {str(e)}"}), 500
 
+async def stream_check(checker: MXChecker) -> AsyncIterator[str]:
+    """Yield a check's results as server-sent events, ending with the full results."""
+    try:
+        await checker.get_mx_records()
+        yield f"data: {app.json.dumps({'host': None, 'check': 'mx_records', 'result': checker.results['mx_records']})}\n\n"
+        async for event in checker.iter_diagnostics():
+            yield f"data: {app.json.dumps(event)}\n\n"
+        yield f"data: {app.json.dumps({'host': None, 'check': 'done', 'result': checker.results})}\n\n"
+    except Exception as e:
+        yield f"data: {app.json.dumps({'error': f'Internal server error: {str(e)}'})}\n\n"
+
 @app.route('/api/status', methods=['GET'])
-def api_status():
+async def api_status():
     return jsonify({"status": "MailSentry API is running", "version": "1.0.0"})
 
-def run_flask():
-    """Run Flask server in the main thread."""
-    app.run(host='0.0.0.0', port=5001, debug=True)
+@app.before_serving
+async def prewarm_dnsbl():
+    """Warm the upstream resolver for all DNSBL zones without holding up startup."""
+    app.add_background_task(prewarm_blacklists)
+
+def run_server():
+    """Serve the API with uvicorn in the main thread (uvloop is used when installed)."""
+    uvicorn.run(app, host='0.0.0.0', port=5001, loop='auto')
 
 async def main():
     """Main function for terminal usage."""
@@ -230,8 +687,7 @@ async def main():
             break
         print("Error: Please enter a valid domain (e.g., example.com)")
     checker = MXChecker(domain)
-    checker.get_mx_records()
-    checker.run_diagnostics()
+    await checker.check()
     checker.display_results()
 
 def run_terminal():
@@ -245,9 +701,9 @@ if __name__ == "__main__":
     # Start terminal interface in a separate thread
     terminal_thread = threading.Thread(target=run_terminal, daemon=True)
     terminal_thread.start()
-    # Run Flask in the main thread
+    # Run the API server in the main thread
     try:
-        run_flask()
+        run_server()
     except KeyboardInterrupt:
         print("\nShutting down MailSentry...")
         exit(0)
\ No newline at end of file
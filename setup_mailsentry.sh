@@ -4,5 +4,5 @@ conda deactivate
 pyenv shell 3.11.0
 python3 -m venv mailsentry_env
 source mailsentry_env/bin/activate
-pip install dnspython flask
+pip install dnspython quart uvicorn
 python3 mailsch.py
\ No newline at end of file